@@ -3,20 +3,144 @@ Book Management System - Final Version
 SQLite backend with Rich CLI interface
 """
 
+import functools
 import sqlite3
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+import string
+import sys
+import time
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING, List, Dict, Any, Callable, Iterable, Iterator, Optional,
+    Tuple
+)
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.style import Style
+from rich.text import Text
+
+if TYPE_CHECKING:
+    from rich.table import Table
 
 # =====================================
 # CONSTANTS
 # =====================================
 DB_NAME = "ebookstore.db"
+LOW_STOCK_THRESHOLD = 3
 console = Console()
 
+# WAL journal + NORMAL sync: commits append to the log instead of a full
+# fsync; mmap serves hot pages from the OS page cache without read() calls
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+_SQL_CREATE_BOOKS = """
+    CREATE TABLE IF NOT EXISTS books (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL CHECK(length(trim(title)) > 0),
+        author TEXT NOT NULL CHECK(length(trim(author)) > 0),
+        quantity INTEGER DEFAULT 0 CHECK(quantity >= 0),
+        price REAL DEFAULT 0.0 CHECK(price >= 0),
+        date_added INTEGER,
+        last_updated INTEGER,
+        title_ci TEXT GENERATED ALWAYS AS (lower(title)) VIRTUAL,
+        author_ci TEXT GENERATED ALWAYS AS (lower(author)) VIRTUAL
+    )
+"""
+
+# Legacy ISO timestamp (local time) or digit string -> epoch seconds
+_SQL_EPOCH = (
+    "CASE WHEN {0} GLOB '*[^0-9]*' "
+    "THEN CAST(strftime('%s', {0}, 'utc') AS INTEGER) "
+    "ELSE CAST({0} AS INTEGER) END"
+)
+
+# Legacy rows that satisfy the CHECK rules in _SQL_CREATE_BOOKS; a NULL
+# quantity or price passes a CHECK, so it passes here too
+_SQL_LEGACY_VALID = (
+    "length(trim(title)) > 0 AND length(trim(author)) > 0 "
+    "AND coalesce(quantity >= 0, 1) AND coalesce(price >= 0, 1)"
+)
+
+# Fixed statement text so sqlite3's statement cache reuses the prepared plan
+_SQL_INSERT_BOOK = "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?)"
+_BOOK_COLUMNS = "id, title, author, quantity, price, date_added, last_updated"
+# RETURNING yields values before column affinity applies, so a whole-number
+# price would come back as an int; cast it to match what SELECT returns
+_RETURNING_COLUMNS = (
+    "id, title, author, quantity, CAST(price AS REAL) AS price, "
+    "date_added, last_updated"
+)
+_SQL_INSERT_BOOK_RETURNING = (
+    _SQL_INSERT_BOOK + " RETURNING " + _RETURNING_COLUMNS
+)
+_SQL_SELECT_BOOKS = f"SELECT {_BOOK_COLUMNS} FROM books"
+_SQL_GET_BOOK = _SQL_SELECT_BOOKS + " WHERE id = ?"
+_SQL_DELETE_BOOK = "DELETE FROM books WHERE id = ?"
+# The planner only uses a partial index when the query repeats its WHERE
+# clause verbatim, so the default threshold is inlined as a literal
+_LOW_STOCK_WHERE = f" WHERE quantity < {LOW_STOCK_THRESHOLD}"
+_SQL_LOW_STOCK = _SQL_SELECT_BOOKS + _LOW_STOCK_WHERE
+# Fold the probe with SQLite's own lower() so it matches the stored
+# title_ci/author_ci values exactly
+_SQL_DUPLICATE = (
+    "SELECT 1 FROM books WHERE title_ci=lower(?) AND author_ci=lower(?) "
+    "LIMIT 1"
+)
+_SQL_DUPLICATE_EXCLUDING = (
+    "SELECT 1 FROM books WHERE title_ci=lower(?) AND author_ci=lower(?) "
+    "AND id != ? LIMIT 1"
+)
+
+# search_books filter name -> WHERE clause; "fts" carries the MATCH terms
+_SEARCH_CLAUSES = {
+    "title": "title LIKE ?",
+    "author": "author LIKE ?",
+    "id": "id = ?",
+    "max_price": "price <= ?",
+    "min_price": "price >= ?",
+    # Low-stock search: books with fewer than `value` copies
+    "min_stock": "quantity < ?",
+    "fts": "id IN (SELECT rowid FROM books_fts WHERE books_fts MATCH ?)",
+}
+
+# Rows pulled per fetchmany() call when streaming results
+FETCH_BATCH = 128
+
+# Trigram full-text index over title/author, kept in sync by triggers
+FTS_MIN_TERM = 3
+_SQL_FTS_SETUP = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, content='books', content_rowid='id',
+        tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author)
+        VALUES (new.id, new.title, new.author);
+    END;
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+    END;
+    CREATE TRIGGER IF NOT EXISTS books_fts_au
+    AFTER UPDATE OF id, title, author ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_fts(rowid, title, author)
+        VALUES (new.id, new.title, new.author);
+    END;
+"""
+
+# Quantity cell styles, built once instead of parsed from markup per row
+RED = Style(color="red")
+GREEN = Style(color="green")
+
 STYLES = {
     "info": "bold cyan",
     "success": "bold green",
@@ -34,6 +158,39 @@ TITLES = {
     "dashboard": "📊 Dashboard"
 }
 
+MENUS = {
+    "main": (
+        "1. Add Book\n2. Update Book\n3. Delete Book\n"
+        "4. Search Books\n5. View Inventory\n6. Dashboard\nx. Exit"
+    ),
+    "update": (
+        "[bold]1.[/bold] ID | "
+        "[bold]2.[/bold] Title | "
+        "[bold]3.[/bold] Author | "
+        "[bold]4.[/bold] Quantity | "
+        "[bold]5.[/bold] Price | "
+        "[bold]6.[/bold] Update All | "
+        "[bold]x.[/bold] Back"
+    ),
+    "search": (
+        "1. By ID\n2. By Title\n3. By Author\n4. By Max Price\n"
+        "5. By Min Price\n6. By Low Stock\nx. Back"
+    ),
+}
+
+# Update menu choice -> bitmask of the fields it edits; each field choice
+# owns one bit and "Update All" sets all of them
+UPDATE_CHOICE_MASKS = {"1": 1, "2": 2, "3": 4, "4": 8, "5": 16, "6": 31}
+
+DETAIL_TEMPLATE = (
+    "[cyan]Current Book:[/cyan] "
+    "[yellow]ID:[/yellow] {id} | "
+    "[yellow]Title:[/yellow] {title} | "
+    "[yellow]Author:[/yellow] {author} | "
+    "[yellow]Qty:[/yellow] {quantity} | "
+    "[yellow]Price:[/yellow] {price}"
+)
+
 MESSAGES = {
     "bye": "👋 Goodbye!",
     "not_found": "❌ Book not found.",
@@ -45,10 +202,100 @@ MESSAGES = {
     "add_failed": "❌ Failed to add book.",
     "no_changes": "ℹ️ No changes detected - book not updated",
     "duplicate": "❌ A book with this Title and Author already exists!",
-    "id_exists": "❌ This ID already exists for another book!"
+    "id_exists": "❌ This ID already exists for another book!",
+    "migration_rejects": (
+        "⚠️ {count} old book(s) break the current field rules and were "
+        "moved to the books_rejected table."
+    ),
 }
 
 
+# =====================================
+# INPUT
+# =====================================
+class _PipedInput:
+    """Line reader for stdin; raises EOFError at EOF so run() can exit."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readline(self) -> str:
+        """Return the next line without its newline, like input()."""
+        line = self.stream.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
+
+
+# Piped output skips rich table rendering and is written as plain rows
+PLAIN_OUTPUT = not sys.stdout.isatty()
+
+# Every stdin read goes through one line reader
+STDIN_LINES = _PipedInput(sys.stdin)
+
+# Scripted runs pipe answers in; read them with readline instead of input()
+PROMPT_STREAM = None if sys.stdin.isatty() else STDIN_LINES
+
+
+def ask(prompt: str, **kwargs) -> str:
+    """Prompt the user, reading piped stdin line by line when not a tty."""
+    return Prompt.ask(prompt, stream=PROMPT_STREAM, **kwargs)
+
+
+def _raw_prompt(label: str) -> str:
+    """
+    Read one line for a numeric entry, bypassing rich's Prompt.
+
+    Suits prompts that need no choices or default handling. Surrounding
+    whitespace is stripped as Prompt.ask does, so " x " still cancels.
+    """
+    if label:
+        console.print(f"{label}:", end=" ")
+        sys.stdout.flush()
+    return STDIN_LINES.readline().strip()
+
+
+def _parse_int(text: str) -> Optional[int]:
+    """Parse an integer in one pass, returning None if it is not one."""
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+# =====================================
+# FORMATTING
+# =====================================
+@functools.lru_cache(maxsize=1024)
+def _fmt_price(price: float) -> str:
+    """Format a price as rands, reusing the string for repeated prices."""
+    return f"R{price:.2f}"
+
+
+# SQLite's lower() folds ASCII letters only
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _fold(text: str) -> str:
+    """Case-fold text the way the title_ci/author_ci columns do."""
+    return text.translate(_ASCII_LOWER)
+
+
+# =====================================
+# DEFERRED IMPORTS
+# =====================================
+_TABLE = None
+
+
+def _table_class():
+    """Import rich's Table on first use; short sessions never need it."""
+    global _TABLE
+    if _TABLE is None:
+        from rich.table import Table
+        _TABLE = Table
+    return _TABLE
+
+
 # =====================================
 # DATABASE HANDLER
 # =====================================
@@ -57,25 +304,46 @@ class BookDatabase:
 
     def __init__(self, db_name: str = DB_NAME):
         """Initialize database connection and setup tables."""
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
+        self.conn = sqlite3.connect(db_name, cached_statements=256)
+        self.conn.row_factory = sqlite3.Row
+        # One cursor per role: a read never clobbers the result set of a
+        # write in progress (e.g. a RETURNING row) and vice versa
+        self._read_cursor = self.conn.cursor()
+        self._write_cursor = self.conn.cursor()
+        # Kept for callers of the original single-cursor API
+        self.cursor = self._write_cursor
+        self._update_sql_cache: Dict[Tuple[str, ...], str] = {}
+        self._search_sql_cache: Dict[Tuple[str, ...], str] = {}
+        self._in_batch = False
+        # Legacy rows the date migration could not fit in the new schema
+        self.migrated_rejects = 0
         self._setup()
 
     def _setup(self):
         """Create database table and sample data if not exists."""
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS books (
-                id INTEGER PRIMARY KEY,
-                title TEXT NOT NULL,
-                author TEXT NOT NULL,
-                quantity INTEGER DEFAULT 0,
-                price REAL DEFAULT 0.0,
-                date_added TEXT,
-                last_updated TEXT
-            )
-            """
+        for pragma in PRAGMAS:
+            self._write_cursor.execute(pragma)
+        self._migrate_dates()
+        self._write_cursor.execute(_SQL_CREATE_BOOKS)
+        self._add_ci_columns()
+        self._write_cursor.execute(
+            "DROP INDEX IF EXISTS idx_books_title_author_ci"
+        )
+        self._write_cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_books_ci "
+            "ON books(title_ci, author_ci)"
+        )
+        self._write_cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_books_price ON books(price)"
+        )
+        self._write_cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_books_quantity ON books(quantity)"
+        )
+        self._write_cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_low_stock ON books(quantity)"
+            + _LOW_STOCK_WHERE
         )
+        self._setup_fts()
         books = [
             (3001, "A Tale of Two Cities", "Charles Dickens", 30, 19.99),
             (3002, "Harry Potter", "J.K. Rowling", 40, 24.99),
@@ -84,14 +352,115 @@ class BookDatabase:
             (3004, "The Lord of the Rings", "J.R.R. Tolkien", 37, 29.99),
             (3005, "Alice in Wonderland", "Lewis Carroll", 12, 14.95),
         ]
-        now = datetime.now().isoformat()
-        self.cursor.executemany(
-            "INSERT OR IGNORE INTO books VALUES (?, ?, ?, ?, ?, ?, ?)",
-            [(*b, now, now) for b in books],
+        now = int(time.time())
+        rows = [(*b, now, now) for b in books]
+        with self.conn:
+            self._write_cursor.executemany(
+                "INSERT OR IGNORE INTO books VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _migrate_dates(self):
+        """
+        Rebuild a books table created with TEXT date columns.
+
+        TEXT affinity would turn every epoch written into a digit string
+        beside the old ISO values, so the rows are copied into the current
+        schema with both date columns converted to epoch seconds. Rows
+        that break the newer CHECK rules are set aside in books_rejected,
+        which has no constraints; their count is kept in migrated_rejects.
+        """
+        self._write_cursor.execute("PRAGMA table_info(books)")
+        types = {row["name"]: row["type"]
+                 for row in self._write_cursor.fetchall()}
+        if types.get("date_added", "INTEGER").upper() == "INTEGER":
+            return
+        dates = ", ".join(
+            _SQL_EPOCH.format(column)
+            for column in ("date_added", "last_updated")
         )
+        self._write_cursor.execute("BEGIN")
+        try:
+            # The FTS triggers would follow the rename; they are recreated
+            # against the new table by _setup_fts
+            for trigger in ("books_fts_ai", "books_fts_ad", "books_fts_au"):
+                self._write_cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            self._write_cursor.execute(
+                "ALTER TABLE books RENAME TO books_legacy"
+            )
+            self._write_cursor.execute(_SQL_CREATE_BOOKS)
+            select = (
+                f"SELECT id, title, author, quantity, price, {dates} "
+                "FROM books_legacy WHERE "
+            )
+            self._write_cursor.execute(
+                "INSERT INTO books (id, title, author, quantity, price, "
+                "date_added, last_updated) "
+                + select + _SQL_LEGACY_VALID
+            )
+            self._write_cursor.execute(
+                "CREATE TABLE IF NOT EXISTS books_rejected AS "
+                + select + "0"
+            )
+            self._write_cursor.execute(
+                "INSERT INTO books_rejected "
+                + select + f"NOT ({_SQL_LEGACY_VALID})"
+            )
+            self.migrated_rejects = self._write_cursor.rowcount
+            self._write_cursor.execute("DROP TABLE books_legacy")
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
         self.conn.commit()
 
-    def add_book(self, data: Dict[str, Any]) -> bool:
+    def _add_ci_columns(self):
+        """Add the case-folded columns to tables created before them."""
+        self._write_cursor.execute("PRAGMA table_xinfo(books)")
+        columns = {row["name"] for row in self._write_cursor.fetchall()}
+        for column, source in (("title_ci", "title"), ("author_ci", "author")):
+            if column not in columns:
+                self._write_cursor.execute(
+                    f"ALTER TABLE books ADD COLUMN {column} TEXT "
+                    f"GENERATED ALWAYS AS (lower({source})) VIRTUAL"
+                )
+
+    def _setup_fts(self):
+        """Create the full-text index, backfilling it on first creation."""
+        self._write_cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'books_fts'"
+        )
+        exists = self._write_cursor.fetchone() is not None
+        self._write_cursor.executescript(_SQL_FTS_SETUP)
+        if not exists:
+            with self.conn:
+                self._write_cursor.execute(
+                    "INSERT INTO books_fts(books_fts) VALUES ('rebuild')"
+                )
+
+    @contextmanager
+    def batch(self) -> Iterator["BookDatabase"]:
+        """
+        Group several writes into a single transaction.
+
+        Writes made inside the block skip their own commit; the whole
+        block is committed once on exit, or rolled back on error.
+        """
+        if self._in_batch:
+            yield self
+            return
+        self._in_batch = True
+        try:
+            with self.conn:
+                yield self
+        finally:
+            self._in_batch = False
+
+    def _commit(self):
+        """Commit the current write unless a batch owns the transaction."""
+        if not self._in_batch:
+            self.conn.commit()
+
+    def add_book(self, data: Dict[str, Any]) -> Optional[sqlite3.Row]:
         """
         Add a new book to the database.
 
@@ -99,23 +468,51 @@ class BookDatabase:
             data: Dictionary containing book details
 
         Returns:
-            bool: True if book was added successfully
+            Optional[sqlite3.Row]: The stored book, None if it was not added
         """
-        now = datetime.now().isoformat()
+        now = int(time.time())
         try:
-            self.cursor.execute(
-                "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?)",
+            self._write_cursor.execute(
+                _SQL_INSERT_BOOK_RETURNING,
                 (
                     data["id"], data["title"], data["author"],
                     data["quantity"], data["price"], now, now,
                 ),
             )
-            self.conn.commit()
+            row = self._write_cursor.fetchone()
+            self._commit()
+            return row
+        except sqlite3.Error:
+            return None
+
+    def add_books_bulk(self, data_list: List[Dict[str, Any]]) -> bool:
+        """
+        Add several books in a single transaction.
+
+        Args:
+            data_list: List of dictionaries containing book details
+
+        Returns:
+            bool: True if all books were added, False if none were
+        """
+        now = int(time.time())
+        rows = [
+            (
+                data["id"], data["title"], data["author"],
+                data["quantity"], data["price"], now, now,
+            )
+            for data in data_list
+        ]
+        try:
+            with self.batch():
+                self._write_cursor.executemany(_SQL_INSERT_BOOK, rows)
             return True
         except sqlite3.Error:
             return False
 
-    def update_book(self, book_id: int, updates: Dict[str, Any]) -> bool:
+    def update_book(
+        self, book_id: int, updates: Dict[str, Any]
+    ) -> Optional[sqlite3.Row]:
         """
         Update an existing book's details.
 
@@ -124,20 +521,31 @@ class BookDatabase:
             updates: Dictionary of fields to update
 
         Returns:
-            bool: True if update was successful
+            Optional[sqlite3.Row]: The updated book, None if nothing changed
         """
-        now = datetime.now().isoformat()
+        now = int(time.time())
+        values = list(updates.values()) + [now, book_id]
+        sql = self._update_sql(tuple(updates))
         try:
-            set_clause = ", ".join(f"{k} = ?" for k in updates)
-            values = list(updates.values()) + [now, book_id]
-            self.cursor.execute(
-             f"UPDATE books SET {set_clause}, last_updated = ? WHERE id = ?",
-             values,
-            )
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+            # Commits on success and rolls back on error, including when
+            # the update renumbers the book's primary key
+            with self.batch():
+                self._write_cursor.execute(sql, values)
+                return self._write_cursor.fetchone()
         except sqlite3.Error:
-            return False
+            return None
+
+    def _update_sql(self, columns: Tuple[str, ...]) -> str:
+        """Return the UPDATE statement for a column set, built once."""
+        sql = self._update_sql_cache.get(columns)
+        if sql is None:
+            set_clause = ", ".join(f"{k} = ?" for k in columns)
+            sql = (
+                f"UPDATE books SET {set_clause}, last_updated = ? "
+                f"WHERE id = ? RETURNING {_RETURNING_COLUMNS}"
+            )
+            self._update_sql_cache[columns] = sql
+        return sql
 
     def delete_book(self, book_id: int) -> bool:
         """
@@ -149,11 +557,11 @@ class BookDatabase:
         Returns:
             bool: True if deletion was successful
         """
-        self.cursor.execute("DELETE FROM books WHERE id = ?", (book_id,))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        self._write_cursor.execute(_SQL_DELETE_BOOK, (book_id,))
+        self._commit()
+        return self._write_cursor.rowcount > 0
 
-    def get_book(self, book_id: int) -> Optional[Dict[str, Any]]:
+    def get_book(self, book_id: int) -> Optional[sqlite3.Row]:
         """
         Retrieve a book's details by ID.
 
@@ -161,13 +569,12 @@ class BookDatabase:
             book_id: ID of book to retrieve
 
         Returns:
-            Optional[Dict]: Book details if found, None otherwise
+            Optional[sqlite3.Row]: Book details if found, None otherwise
         """
-        self.cursor.execute("SELECT * FROM books WHERE id = ?", (book_id,))
-        row = self.cursor.fetchone()
-        return self._row_to_dict(row) if row else None
+        self._read_cursor.execute(_SQL_GET_BOOK, (book_id,))
+        return self._read_cursor.fetchone()
 
-    def search_books(self, **filters) -> List[Dict[str, Any]]:
+    def search_books(self, **filters) -> List[sqlite3.Row]:
         """
         Search books based on provided filters.
 
@@ -175,38 +582,109 @@ class BookDatabase:
             **filters: Keyword arguments for filtering
 
         Returns:
-            List[Dict]: List of matching books
+            List[sqlite3.Row]: List of matching books
         """
-        query = "SELECT * FROM books"
-        params, conditions = [], []
+        self._read_cursor.execute(*self._search_query(filters))
+        return self._read_cursor.fetchall()
+
+    def iter_search_books(self, **filters) -> Iterator[sqlite3.Row]:
+        """
+        Stream books matching the filters without building a list.
+
+        Args:
+            **filters: Keyword arguments for filtering, as in search_books
+
+        Returns:
+            Iterator[sqlite3.Row]: Matching books, fetched in batches
+        """
+        return self._stream(*self._search_query(filters))
+
+    def _search_query(
+        self, filters: Dict[str, Any]
+    ) -> Tuple[str, List[Any]]:
+        """Build the search SQL and its parameters from the filters."""
+        shape, params, matches = [], [], []
 
         for field, value in filters.items():
-            if field in ["title", "author"]:
-                conditions.append(f"{field} LIKE ?")
+            if field in ["title", "author"] and len(value) >= FTS_MIN_TERM:
+                # Quote as an FTS5 phrase so user input is never parsed
+                phrase = value.replace('"', '""')
+                matches.append(f'{field}:"{phrase}"')
+            elif field in ["title", "author"]:
+                # Too short for a trigram lookup, fall back to a scan
+                shape.append(field)
                 params.append(f"%{value}%")
-            elif field == "id":
-                conditions.append("id = ?")
-                params.append(value)
-            elif field == "max_price":
-                conditions.append("price <= ?")
-                params.append(value)
-            elif field == "min_price":
-                conditions.append("price >= ?")  # Fixed min_price filter
-                params.append(value)
-            elif field == "min_stock":
-                conditions.append("quantity < ?")
+            elif field in _SEARCH_CLAUSES:
+                shape.append(field)
                 params.append(value)
 
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+        if matches:
+            shape.append("fts")
+            params.append(" AND ".join(matches))
+
+        # Same filter shape, same SQL text: reuse it and its prepared plan
+        key = tuple(shape)
+        query = self._search_sql_cache.get(key)
+        if query is None:
+            query = _SQL_SELECT_BOOKS
+            if key:
+                query += " WHERE " + " AND ".join(
+                    _SEARCH_CLAUSES[field] for field in key
+                )
+            self._search_sql_cache[key] = query
+        return query, params
+
+    def _stream(self, query: str, params=()) -> Iterator[sqlite3.Row]:
+        """Yield rows in FETCH_BATCH chunks from a cursor of their own."""
+        cursor = self.conn.cursor()
+        cursor.arraysize = FETCH_BATCH
+        cursor.execute(query, params)
+        rows = cursor.fetchmany()
+        while rows:
+            yield from rows
+            rows = cursor.fetchmany()
+
+    def get_all_books(self) -> List[sqlite3.Row]:
+        """Retrieve all books from the database."""
+        self._read_cursor.execute(_SQL_SELECT_BOOKS)
+        return self._read_cursor.fetchall()
 
-        self.cursor.execute(query, params)
-        return [self._row_to_dict(row) for row in self.cursor.fetchall()]
+    def iter_books(self) -> Iterator[sqlite3.Row]:
+        """Stream all books in ID order without building a list."""
+        return self._stream(_SQL_SELECT_BOOKS + " ORDER BY id")
 
-    def get_all_books(self) -> List[Dict[str, Any]]:
-        """Retrieve all books from the database."""
-        self.cursor.execute("SELECT * FROM books")
-        return [self._row_to_dict(row) for row in self.cursor.fetchall()]
+    def get_stats(self) -> Tuple[int, int, float]:
+        """
+        Compute inventory totals inside SQLite.
+
+        Returns:
+            Tuple[int, int, float]: (book count, total quantity, total value)
+        """
+        self._read_cursor.execute(
+            "SELECT COUNT(*), COALESCE(SUM(quantity), 0), "
+            "COALESCE(SUM(price * quantity), 0) FROM books"
+        )
+        return tuple(self._read_cursor.fetchone())
+
+    def get_low_stock(
+        self, threshold: int = LOW_STOCK_THRESHOLD
+    ) -> List[sqlite3.Row]:
+        """
+        Retrieve books with fewer copies than the threshold.
+
+        Args:
+            threshold: Quantity below which a book counts as low stock
+
+        Returns:
+            List[sqlite3.Row]: Low-stock books
+        """
+        if threshold == LOW_STOCK_THRESHOLD:
+            self._read_cursor.execute(_SQL_LOW_STOCK)
+        else:
+            self._read_cursor.execute(
+                _SQL_SELECT_BOOKS + " WHERE quantity < ?", (threshold,)
+            )
+        return self._read_cursor.fetchall()
 
     def is_duplicate_title_author(
         self, title: str, author: str, exclude_id: int = None
@@ -222,25 +700,13 @@ class BookDatabase:
         Returns:
             bool: True if duplicate exists
         """
-        query = "SELECT id FROM books WHERE lower(title)=? AND lower(author)=?"
-        params = (title.lower(), author.lower())
         if exclude_id:
-            query += " AND id != ?"
-            params += (exclude_id,)
-        self.cursor.execute(query, params)
-        return self.cursor.fetchone() is not None
-
-    def _row_to_dict(self, row) -> Dict[str, Any]:
-        """Convert a database row to dictionary format."""
-        return {
-            "id": row[0],
-            "title": row[1],
-            "author": row[2],
-            "quantity": row[3],
-            "price": row[4],
-            "date_added": row[5],
-            "last_updated": row[6],
-        }
+            self._read_cursor.execute(
+                _SQL_DUPLICATE_EXCLUDING, (title, author, exclude_id)
+            )
+        else:
+            self._read_cursor.execute(_SQL_DUPLICATE, (title, author))
+        return self._read_cursor.fetchone() is not None
 
     def close(self):
         """Close the database connection."""
@@ -253,9 +719,21 @@ class BookDatabase:
 class BookManager:
     """Handles CLI interaction and menus for book management."""
 
+    # Styles and messages printed on almost every prompt, bound once
+    ERR_STYLE = STYLES["error"]
+    WARN_STYLE = STYLES["warning"]
+    INFO_STYLE = STYLES["info"]
+    OK_STYLE = STYLES["success"]
+    MSG_CANCEL = MESSAGES["cancel"]
+    MSG_NOT_FOUND = MESSAGES["not_found"]
+
     def __init__(self):
         """Initialize the book manager with database connection."""
         self.db = BookDatabase()
+        if self.db.migrated_rejects:
+            console.print(MESSAGES["migration_rejects"].format(
+                count=self.db.migrated_rejects
+            ), style=self.WARN_STYLE)
         self.actions = {
             "1": self.add_book,
             "2": self.update_book,
@@ -264,6 +742,66 @@ class BookManager:
             "5": self.view_inventory,
             "6": self.dashboard
         }
+        # Update menu choice -> (column, label, input parser, validator);
+        # add_book walks the same table to prompt for a new book
+        self.update_fields = {
+            "1": ("id", "ID", int, self._validate_id),
+            "2": ("title", "Title", str.strip, self._validate_text),
+            "3": ("author", "Author", str.strip, self._validate_text),
+            "4": ("quantity", "Quantity", int, self._validate_quantity),
+            "5": ("price", "Price", float, self._validate_price),
+        }
+        # Search menu choice -> (prompt, filter name, input parser)
+        self.search_filters = {
+            "1": ("Enter Book ID", "id", int),
+            "2": ("Enter Title", "title", str),
+            "3": ("Enter Author", "author", str),
+            "4": ("Enter Max Price", "max_price", float),
+            "5": ("Enter Min Price", "min_price", float),
+            "6": ("Show stock lower than", "min_stock", int),
+        }
+        # Session copy of the inventory, loaded on first lookup and kept
+        # in step with every write this manager makes
+        self._cache: Optional[Dict[int, Any]] = None
+        self._dup_index: Dict[Tuple[str, str], int] = {}
+
+    # =====================================
+    # SESSION CACHE
+    # =====================================
+    def _load_cache(self) -> Dict[int, Any]:
+        """Load every book into the session cache on first use."""
+        if self._cache is None:
+            self._cache = {}
+            for book in self.db.iter_books():
+                self._cache_put(book)
+        return self._cache
+
+    def _cache_put(self, book: Any):
+        """Insert or replace a book in the session cache."""
+        if self._cache is None:
+            return
+        self._cache[book["id"]] = book
+        key = (_fold(book["title"]), _fold(book["author"]))
+        self._dup_index[key] = book["id"]
+
+    def _cache_pop(self, book_id: int):
+        """Drop a book and its title/author key from the session cache."""
+        if self._cache is None:
+            return
+        book = self._cache.pop(book_id, None)
+        if book is not None:
+            key = (_fold(book["title"]), _fold(book["author"]))
+            if self._dup_index.get(key) == book_id:
+                del self._dup_index[key]
+
+    def _reset_cache(self):
+        """Discard the session cache so the next lookup reloads it."""
+        self._cache = None
+        self._dup_index = {}
+
+    def _cached_book(self, book_id: int) -> Optional[Any]:
+        """Look a book up by ID without touching the database."""
+        return self._load_cache().get(book_id)
 
     # =====================================
     # VALIDATION METHODS
@@ -282,7 +820,7 @@ class BookManager:
         """
         if book_id <= 0:
             return False, "ID must be positive"
-        existing_book = self.db.get_book(book_id)
+        existing_book = self._cached_book(book_id)
         if existing_book and (exclude_id is None or existing_book["id"] !=
                               exclude_id):
             return False, MESSAGES["id_exists"]
@@ -344,115 +882,128 @@ class BookManager:
         Returns:
             Tuple[bool, str]: (is_valid, error_message)
         """
-        if self.db.is_duplicate_title_author(title, author, exclude_id):
+        self._load_cache()
+        owner = self._dup_index.get((_fold(title), _fold(author)))
+        if owner is not None and owner != exclude_id:
             return False, MESSAGES["duplicate"]
         return True, ""
 
     def run(self):
-        """Run the main program loop."""
-        while True:
-            console.print(Panel(TITLES["main"], style=STYLES["info"]))
-            console.print(
-                "1. Add Book\n2. Update Book\n3. Delete Book\n"
-                "4. Search Books\n5. View Inventory\n6. Dashboard\nx. Exit"
-            )
-            choice = Prompt.ask(
-                "Choose option",
-                choices=list(self.actions) + ["x"]
-            )
-            if choice == "x":
-                console.print(MESSAGES["bye"], style=STYLES["success"])
-                self.db.close()
-                break
-            self.actions[choice]()
+        """Run the main program loop until "x" or the end of piped input."""
+        try:
+            while True:
+                console.print(Panel(TITLES["main"], style=self.INFO_STYLE))
+                console.print(MENUS["main"])
+                choice = ask(
+                    "Choose option",
+                    choices=list(self.actions) + ["x"]
+                )
+                if choice == "x":
+                    break
+                self.actions[choice]()
+        except EOFError:
+            # Input ran out mid-prompt; finish that line, then exit as "x"
+            console.print()
+        console.print(MESSAGES["bye"], style=self.OK_STYLE)
+        self.db.close()
 
     def add_book(self):
         """Handle adding a new book with full validation."""
-        while True:
-            console.print(Panel(TITLES["add"], style=STYLES["info"]))
-            book_data = {}
+        console.print(Panel(TITLES["add"], style=self.INFO_STYLE))
+        raw = self._collect_fields(self.update_fields.values())
+        while raw is not None:
+            book_data, errors = self._validate_all(raw)
+            if not errors:
+                break
+            for msg in dict.fromkeys(errors.values()):
+                console.print(msg, style=self.ERR_STYLE)
+            # Ask again for the rejected fields only
+            retry = self._collect_fields(
+                field for field in self.update_fields.values()
+                if field[0] in errors
+            )
+            if retry is None:
+                raw = None
+            else:
+                raw.update(retry)
+        if raw is None:
+            console.print(self.MSG_CANCEL, style=self.WARN_STYLE)
+            return
 
-            # Get and validate ID
-            val = Prompt.ask("Book ID (x to cancel)")
-            if val.lower() == "x":
-                console.print(MESSAGES["cancel"], style=STYLES["warning"])
-                return
-            if not val.isdigit():
-                console.print("❌ ID must be a number.", style=STYLES["error"])
-                continue
-            book_data["id"] = int(val)
-            valid, msg = self._validate_id(book_data["id"])
-            if not valid:
-                console.print(f"❌ {msg}", style=STYLES["error"])
-                continue
+        # The session cache passed the ID and pair, so a rejected insert
+        # means the table changed under it: ask SQLite for the reason and
+        # reload the cache on next use
+        row = self.db.add_book(book_data)
+        if row:
+            self._cache_put(row)
+            console.print(MESSAGES["added"], style=self.OK_STYLE)
+            return
+        self._reset_cache()
+        if self.db.is_duplicate_title_author(
+            book_data["title"], book_data["author"]
+        ):
+            console.print(MESSAGES["duplicate"], style=self.ERR_STYLE)
+        else:
+            console.print(MESSAGES["add_failed"], style=self.ERR_STYLE)
 
-            # Get and validate Title
-            title = Prompt.ask("Title (x to cancel)")
-            if title.lower() == "x":
-                console.print(MESSAGES["cancel"], style=STYLES["warning"])
-                return
-            valid, msg = self._validate_text(title)
-            if not valid:
-                console.print(f"❌ {msg}", style=STYLES["error"])
-                continue
-            book_data["title"] = title.strip()
+    def _collect_fields(
+        self, fields: Iterable[Tuple[str, str, Callable[[str], Any],
+                                     Callable[[Any], Tuple[bool, str]]]]
+    ) -> Optional[Dict[str, str]]:
+        """
+        Prompt for each field in turn without validating the answers.
 
-            # Get and validate Author
-            author = Prompt.ask("Author (x to cancel)")
-            if author.lower() == "x":
-                console.print(MESSAGES["cancel"], style=STYLES["warning"])
-                return
-            valid, msg = self._validate_text(author)
-            if not valid:
-                console.print(f"❌ {msg}", style=STYLES["error"])
-                continue
-            book_data["author"] = author.strip()
+        Args:
+            fields: (column, label, parser, validator) from update_fields
 
-            # Validate title+author uniqueness
-            valid, msg = self._validate_duplicate(
-                book_data["title"], book_data["author"]
-            )
-            if not valid:
-                console.print(f"❌ {msg}", style=STYLES["error"])
-                continue
+        Returns:
+            Optional[Dict[str, str]]: Raw input by column, None if cancelled
+        """
+        raw = {}
+        for column, label, parse, _ in fields:
+            read = ask if parse is str.strip else _raw_prompt
+            val = read(f"{label} (x to cancel)")
+            if val.lower() == "x":
+                return None
+            raw[column] = val
+        return raw
 
-            # Get and validate Quantity
-            qty = Prompt.ask("Quantity (x to cancel)")
-            if qty.lower() == "x":
-                console.print(MESSAGES["cancel"], style=STYLES["warning"])
-                return
-            if not qty.isdigit():
-                console.print("❌ Quantity must be a number.",
-                              style=STYLES["error"])
-                continue
-            book_data["quantity"] = int(qty)
-            valid, msg = self._validate_quantity(book_data["quantity"])
-            if not valid:
-                console.print(f"❌ {msg}", style=STYLES["error"])
-                continue
+    def _validate_all(
+        self, raw: Dict[str, str]
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Parse and validate every collected field in one pass.
 
-            # Get and validate Price
-            price = Prompt.ask("Price (x to cancel)")
-            if price.lower() == "x":
-                console.print(MESSAGES["cancel"], style=STYLES["warning"])
-                return
+        Args:
+            raw: Raw input by column from _collect_fields
+
+        Returns:
+            Tuple[Dict, Dict]: (parsed book data, error message by column)
+        """
+        book_data = {}
+        errors = {}
+        for column, label, parse, validate in self.update_fields.values():
             try:
-                book_data["price"] = float(price)
+                value = parse(raw[column])
             except ValueError:
-                console.print("❌ Price must be a number.",
-                              style=STYLES["error"])
+                errors[column] = f"❌ {label} must be a number."
                 continue
-            valid, msg = self._validate_price(book_data["price"])
+            # Validators run on parsed values only; for the ID that keeps
+            # the existing-book lookup behind the positive-number check
+            valid, msg = validate(value)
             if not valid:
-                console.print(f"❌ {msg}", style=STYLES["error"])
+                errors[column] = f"❌ {msg}"
                 continue
+            book_data[column] = value
 
-            # Add book to database
-            if self.db.add_book(book_data):
-                console.print(MESSAGES["added"], style=STYLES["success"])
-            else:
-                console.print(MESSAGES["add_failed"], style=STYLES["error"])
-            return
+        # A single pair check once both halves are individually valid
+        if "title" in book_data and "author" in book_data:
+            valid, msg = self._validate_duplicate(
+                book_data["title"], book_data["author"]
+            )
+            if not valid:
+                errors["title"] = errors["author"] = f"❌ {msg}"
+        return book_data, errors
 
     def update_book(self):
         """Handle updating book details with full validation."""
@@ -464,7 +1015,7 @@ class BookManager:
             self._display_book_details(book)
             choice = self._get_update_choice()
             if choice == "x":
-                console.print(MESSAGES["cancel"], style=STYLES["warning"])
+                console.print(self.MSG_CANCEL, style=self.WARN_STYLE)
                 return
 
             updates = self._process_update_choice(choice, book)
@@ -472,56 +1023,44 @@ class BookManager:
                 # Validation failed, try again
                 continue
             elif updates:
-                self._apply_updates(book["id"], updates)
-                # Refresh data
-                book = self.db.get_book(updates.get("id", book["id"]))
+                # The UPDATE hands back the stored row, so a successful
+                # edit needs no follow-up read
+                row = self._apply_updates(book["id"], updates)
+                book = row if row is not None else self._cached_book(
+                    book["id"])
             else:
-                console.print(MESSAGES["no_changes"], style=STYLES["info"])
+                console.print(MESSAGES["no_changes"], style=self.INFO_STYLE)
 
     def _get_book_to_update(self) -> Optional[Dict[str, Any]]:
         """Get a valid book ID from user for updating."""
         while True:
-            console.print(Panel(TITLES["update"], style=STYLES["info"]))
-            val = Prompt.ask("Book ID to update (x to cancel)")
+            console.print(Panel(TITLES["update"], style=self.INFO_STYLE))
+            val = _raw_prompt("Book ID to update (x to cancel)")
 
             if val.lower() == "x":
                 return None
 
-            if not val.isdigit():
-                console.print("❌ ID must be a number.", style=STYLES["error"])
+            book_id = _parse_int(val)
+            if book_id is None:
+                console.print("❌ ID must be a number.", style=self.ERR_STYLE)
                 continue
 
-            book = self.db.get_book(int(val))
+            book = self._cached_book(book_id)
             if not book:
-                console.print(MESSAGES["not_found"], style=STYLES["error"])
+                console.print(self.MSG_NOT_FOUND, style=self.ERR_STYLE)
                 continue
             return book
 
     def _display_book_details(self, book: Dict[str, Any]):
         """Display current details of a book."""
-        details = (
-            f"[cyan]Current Book:[/cyan] "
-            f"[yellow]ID:[/yellow] {book['id']} | "
-            f"[yellow]Title:[/yellow] {book['title']} | "
-            f"[yellow]Author:[/yellow] {book['author']} | "
-            f"[yellow]Qty:[/yellow] {book['quantity']} | "
-            f"[yellow]Price:[/yellow] R{book['price']:.2f}"
-        )
-        console.print(details)
+        console.print(DETAIL_TEMPLATE.format(
+            **{**book, "price": _fmt_price(book["price"])}
+        ))
 
     def _get_update_choice(self) -> str:
         """Get user's choice of field to update."""
-        options = (
-            "[bold]1.[/bold] ID | "
-            "[bold]2.[/bold] Title | "
-            "[bold]3.[/bold] Author | "
-            "[bold]4.[/bold] Quantity | "
-            "[bold]5.[/bold] Price | "
-            "[bold]6.[/bold] Update All | "
-            "[bold]x.[/bold] Back"
-        )
-        console.print(options)
-        return Prompt.ask(
+        console.print(MENUS["update"])
+        return ask(
             "Select field to update",
             choices=["1", "2", "3", "4", "5", "6", "x"]
         )
@@ -539,25 +1078,11 @@ class BookManager:
         updates = {}
         changes_made = False
 
-        if choice in ("1", "6"):
-            if self._handle_id_update(book, updates):
-                changes_made = True
-
-        if choice in ("2", "6"):
-            if self._handle_title_update(book, updates):
-                changes_made = True
-
-        if choice in ("3", "6"):
-            if self._handle_author_update(book, updates):
-                changes_made = True
-
-        if choice in ("4", "6"):
-            if self._handle_quantity_update(book, updates):
-                changes_made = True
-
-        if choice in ("5", "6"):
-            if self._handle_price_update(book, updates):
-                changes_made = True
+        mask = UPDATE_CHOICE_MASKS[choice]
+        for key, field in self.update_fields.items():
+            if mask & UPDATE_CHOICE_MASKS[key]:
+                if self._handle_field_update(field, book, updates):
+                    changes_made = True
 
         # Final duplicate check if both title and author changed
         if "title" in updates and "author" in updates:
@@ -566,165 +1091,58 @@ class BookManager:
 
         return updates if changes_made else {}
 
-    def _handle_id_update(
-        self, book: Dict[str, Any], updates: Dict[str, Any]
-    ) -> bool:
-        """
-        Handle ID update with validation.
-
-        Returns:
-            bool: True if change was made, False otherwise
-        """
-        new_id = Prompt.ask(
-                            "New ID (x to skip)",
-                            default=str(book["id"])
-        )
-        if new_id.lower() == "x":
-            return False
-
-        try:
-            new_id_val = int(new_id)
-        except ValueError:
-            console.print("❌ ID must be a number.", style=STYLES["error"])
-            return False
-
-        if new_id_val == book["id"]:
-            console.print("ℹ️ ID unchanged", style=STYLES["info"])
-            return False
-
-        valid, msg = self._validate_id(new_id_val, exclude_id=book["id"])
-        if not valid:
-            console.print(f"❌ {msg}", style=STYLES["error"])
-            return False
-
-        updates["id"] = new_id_val
-        return True
-
-    def _handle_title_update(
-        self, book: Dict[str, Any], updates: Dict[str, Any]
-    ) -> bool:
-        """
-        Handle title update with validation.
-
-        Returns:
-            bool: True if change was made, False otherwise
-        """
-        title = Prompt.ask("New Title (x to skip)", default=book["title"])
-        if title.lower() == "x":
-            return False
-        if title.strip() == book["title"]:
-            console.print("ℹ️ Title unchanged", style=STYLES["info"])
-            return False
-
-        valid, msg = self._validate_text(title)
-        if not valid:
-            console.print(f"❌ {msg}", style=STYLES["error"])
-            return False
-
-        # Use current author for duplicate check unless it's also being updated
-        author_to_check = updates.get("author", book["author"])
-        valid_dup, msg_dup = self._validate_duplicate(
-            title.strip(), author_to_check, book["id"]
-        )
-        if not valid_dup:
-            console.print(f"❌ {msg_dup}", style=STYLES["error"])
-            return False
-        updates["title"] = title.strip()
-        return True
-
-    def _handle_author_update(
-        self, book: Dict[str, Any], updates: Dict[str, Any]
-    ) -> bool:
-        """
-        Handle author update with validation.
-
-        Returns:
-            bool: True if change was made, False otherwise
-        """
-        author = Prompt.ask("New Author (x to skip)", default=book["author"])
-        if author.lower() == "x":
-            return False
-        if author.strip() == book["author"]:
-            console.print("ℹ️ Author unchanged", style=STYLES["info"])
-            return False
-
-        valid, msg = self._validate_text(author)
-        if not valid:
-            console.print(f"❌ {msg}", style=STYLES["error"])
-            return False
-
-        # Use current title for duplicate check unless it's also being updated
-        title_to_check = updates.get("title", book["title"])
-        valid_dup, msg_dup = self._validate_duplicate(
-            title_to_check, author.strip(), book["id"]
-        )
-        if not valid_dup:
-            console.print(f"❌ {msg_dup}", style=STYLES["error"])
-            return False
-
-        updates["author"] = author.strip()
-        return True
-
-    def _handle_quantity_update(
-        self, book: Dict[str, Any], updates: Dict[str, Any]
+    def _handle_field_update(
+        self,
+        field: Tuple[str, str, Callable[[str], Any],
+                     Callable[[Any], Tuple[bool, str]]],
+        book: Dict[str, Any],
+        updates: Dict[str, Any],
     ) -> bool:
         """
-        Handle quantity update with validation.
-
-        Returns:
-            bool: True if change was made, False otherwise
-        """
-        qty = Prompt.ask("New Quantity (x to skip)",
-                         default=str(book["quantity"]))
-        if qty.lower() == "x":
-            return False
-
-        if not qty.isdigit():
-            console.print("❌ Must be a number.", style=STYLES["error"])
-            return False
+        Prompt for one field's new value and validate it.
 
-        qty_val = int(qty)
-        if qty_val == book["quantity"]:
-            console.print("ℹ️ Quantity unchanged", style=STYLES["info"])
-            return False
-
-        valid, msg = self._validate_quantity(qty_val)
-        if not valid:
-            console.print(f"❌ {msg}", style=STYLES["error"])
-            return False
-
-        updates["quantity"] = qty_val
-        return True
-
-    def _handle_price_update(
-        self, book: Dict[str, Any], updates: Dict[str, Any]
-    ) -> bool:
-        """
-        Handle price update with validation.
+        Args:
+            field: (column, label, parser, validator) from update_fields
+            book: Book being updated
+            updates: Updates collected so far; the new value is added here
 
         Returns:
             bool: True if change was made, False otherwise
         """
-        price = Prompt.ask("New Price (x to skip)", default=str(book["price"]))
-        if price.lower() == "x":
+        column, label, parse, validate = field
+        raw = ask(f"New {label} (x to skip)", default=str(book[column]))
+        if raw.lower() == "x":
             return False
 
         try:
-            price_val = float(price)
+            value = parse(raw)
         except ValueError:
-            console.print("❌ Must be a number.", style=STYLES["error"])
+            console.print(f"❌ {label} must be a number.",
+                          style=self.ERR_STYLE)
             return False
 
-        if price_val == book["price"]:
-            console.print("ℹ️ Price unchanged", style=STYLES["info"])
+        if value == book[column]:
+            console.print(f"ℹ️ {label} unchanged", style=self.INFO_STYLE)
             return False
 
-        valid, msg = self._validate_price(price_val)
+        valid, msg = validate(value)
+        if valid and column in ("title", "author"):
+            # Check the title/author pair as it will be stored
+            pair = {"title": updates.get("title", book["title"]),
+                    "author": updates.get("author", book["author"]),
+                    column: value}
+            # A pair that only differs from the book's own in case cannot
+            # clash with another book: the unique index already forbids it
+            folded = (_fold(pair["title"]), _fold(pair["author"]))
+            if folded != (_fold(book["title"]), _fold(book["author"])):
+                valid, msg = self._validate_duplicate(
+                    pair["title"], pair["author"], book["id"]
+                )
         if not valid:
-            console.print(f"❌ {msg}", style=STYLES["error"])
+            console.print(f"❌ {msg}", style=self.ERR_STYLE)
             return False
 
-        updates["price"] = price_val
+        updates[column] = value
         return True
 
     def _validate_combined_update(
@@ -740,204 +1158,159 @@ class BookManager:
             updates["title"], updates["author"], book_id
         )
         if not valid:
-            console.print(f"❌ {msg}", style=STYLES["error"])
+            console.print(f"❌ {msg}", style=self.ERR_STYLE)
             return False
         return True
 
-    def _apply_updates(self, book_id: int, updates: Dict[str, Any]):
-        """Apply validated updates to database with proper feedback."""
+    def _apply_updates(
+        self, book_id: int, updates: Dict[str, Any]
+    ) -> Optional[sqlite3.Row]:
+        """
+        Apply validated updates to database with proper feedback.
+
+        Returns:
+            Optional[sqlite3.Row]: The updated book, or None if unchanged
+        """
         if not updates:
-            console.print(MESSAGES["no_changes"], style=STYLES["info"])
-            return
+            console.print(MESSAGES["no_changes"], style=self.INFO_STYLE)
+            return None
 
         try:
-            # Special handling for ID update
-            if "id" in updates:
-                # Need to update the primary key - requires special handling
-                book = self.db.get_book(book_id)
-                if not book:
-                    console.print(MESSAGES["not_found"], style=STYLES["error"])
-                    return
-
-                # Create new book with updated ID
-                new_book = {
-                    "id": updates["id"],
-                    "title": updates.get("title", book["title"]),
-                    "author": updates.get("author", book["author"]),
-                    "quantity": updates.get("quantity", book["quantity"]),
-                    "price": updates.get("price", book["price"])
-                }
-
-                # Add new book and delete old one in a transaction
-                self.db.conn.execute("BEGIN TRANSACTION")
-                try:
-                    if self.db.add_book(new_book):
-                        self.db.delete_book(book_id)
-                        self.db.conn.commit()
-                        console.print(MESSAGES["updated"],
-                                      style=STYLES["success"])
-                    else:
-                        self.db.conn.rollback()
-                        console.print(MESSAGES["update_failed"],
-                                      style=STYLES["warning"])
-                except sqlite3.Error as e:
-                    self.db.conn.rollback()
-                    console.print(f"❌ Failed to update ID: {str(e)}",
-                                  style=STYLES["error"])
-            else:
-                # Normal update for non-ID fields
-                if self.db.update_book(book_id, updates):
-                    console.print(MESSAGES["updated"], style=STYLES["success"])
-                else:
-                    console.print(MESSAGES["update_failed"],
-                                  style=STYLES["warning"])
+            # A single UPDATE also renumbers the primary key, so an ID change
+            # never has to insert a copy alongside the original row
+            row = self.db.update_book(book_id, updates)
+            if row:
+                self._cache_pop(book_id)
+                self._cache_put(row)
+                console.print(MESSAGES["updated"], style=self.OK_STYLE)
+                return row
+            console.print(MESSAGES["update_failed"], style=self.WARN_STYLE)
         except Exception as e:
             console.print(f"❌ Error during update: {str(e)}",
-                          style=STYLES["error"])
+                          style=self.ERR_STYLE)
+        return None
 
     def delete_book(self):
         """Handle book deletion with confirmation."""
         while True:
-            console.print(Panel(TITLES["delete"], style=STYLES["info"]))
-            val = Prompt.ask("Book ID to delete (x to cancel)")
+            console.print(Panel(TITLES["delete"], style=self.INFO_STYLE))
+            val = _raw_prompt("Book ID to delete (x to cancel)")
             if val.lower() == "x":
-                console.print(MESSAGES["cancel"], style=STYLES["warning"])
+                console.print(self.MSG_CANCEL, style=self.WARN_STYLE)
                 return
-            if not val.isdigit():
-                console.print("❌ Must be a number.", style=STYLES["error"])
+            book_id = _parse_int(val)
+            if book_id is None:
+                console.print("❌ Must be a number.", style=self.ERR_STYLE)
                 continue
 
-            book_id = int(val)
-            book = self.db.get_book(book_id)
+            book = self._cached_book(book_id)
             if not book:
-                console.print(MESSAGES["not_found"], style=STYLES["error"])
+                console.print(self.MSG_NOT_FOUND, style=self.ERR_STYLE)
                 continue
 
             self._display_book(book)
-            confirm = Prompt.ask(
+            confirm = ask(
                 "❌ Confirm delete? (y/n)",
                 choices=["y", "n"],
                 default="n"
             )
             if confirm.lower() == "y":
                 if self.db.delete_book(book_id):
-                    console.print(MESSAGES["deleted"], style=STYLES["success"])
+                    self._cache_pop(book_id)
+                    console.print(MESSAGES["deleted"], style=self.OK_STYLE)
                 else:
                     console.print("❌ Failed to delete book.",
-                                  style=STYLES["error"])
+                                  style=self.ERR_STYLE)
             return
 
     def search_books(self):
         """Handle book search with various filters."""
         while True:
-            console.print(Panel(TITLES["search"], style=STYLES["info"]))
-            console.print(
-                "1. By ID\n2. By Title\n3. By Author\n4. By Max Price\n"
-                "5. By Min Price\n6. By Low Stock\nx. Back"
-            )
-            choice = Prompt.ask(
+            console.print(Panel(TITLES["search"], style=self.INFO_STYLE))
+            console.print(MENUS["search"])
+            choice = ask(
                 "Choose search type",
-                choices=["1", "2", "3", "4", "5", "6", "x"]
+                choices=list(self.search_filters) + ["x"]
             )
             if choice == "x":
                 return
 
-            filters = {}
-            if choice == "1":
-                val = Prompt.ask("Enter Book ID (x to cancel)")
-                if val.lower() == "x":
-                    continue
-                if not val.isdigit():
-                    console.print("❌ Must be a number.", style=STYLES["error"])
-                    continue
-                filters["id"] = int(val)
-
-            elif choice == "2":
-                title = Prompt.ask("Enter Title (x to cancel)")
-                if title.lower() == "x":
-                    continue
-                filters["title"] = title
-
-            elif choice == "3":
-                author = Prompt.ask("Enter Author (x to cancel)")
-                if author.lower() == "x":
-                    continue
-                filters["author"] = author
-
-            elif choice == "4":
-                val = Prompt.ask("Enter Max Price (x to cancel)")
-                if val.lower() == "x":
-                    continue
-                try:
-                    filters["max_price"] = float(val)
-                except ValueError:
-                    console.print("❌ Must be a number.", style=STYLES["error"])
-                    continue
-
-            elif choice == "5":
-                val = Prompt.ask("Enter Min Price (x to cancel)")
-                if val.lower() == "x":
-                    continue
-                try:
-                    filters["min_price"] = float(val)
-                except ValueError:
-                    console.print("❌ Must be a number.", style=STYLES["error"])
-                    continue
-
-            elif choice == "6":
-                val = Prompt.ask("Show stock lower than (x to cancel)")
-                if val.lower() == "x":
-                    continue
-                if not val.isdigit():
-                    console.print("❌ Must be a number.", style=STYLES["error"])
-                    continue
-                filters["min_stock"] = int(val)
-
-            results = self.db.search_books(**filters)
-            if results:
-                self._display_books(results)
-            else:
-                console.print(MESSAGES["not_found"], style=STYLES["error"])
+            label, field, parse = self.search_filters[choice]
+            # Free-text searches keep rich's prompt; numbers read raw
+            read = ask if parse is str else _raw_prompt
+            val = read(f"{label} (x to cancel)")
+            if val.lower() == "x":
+                continue
+            try:
+                filters = {field: parse(val)}
+            except ValueError:
+                console.print("❌ Must be a number.", style=self.ERR_STYLE)
+                continue
+
+            results = self.db.iter_search_books(**filters)
+            if not self._display_books(results):
+                console.print(self.MSG_NOT_FOUND, style=self.ERR_STYLE)
 
     def view_inventory(self):
         """Display all books in inventory."""
-        books = self.db.get_all_books()
-        if books:
-            self._display_books(books)
-        else:
-            console.print(MESSAGES["not_found"], style=STYLES["error"])
+        if not self._display_books(self.db.iter_books()):
+            console.print(self.MSG_NOT_FOUND, style=self.ERR_STYLE)
 
     def dashboard(self):
         """Display inventory dashboard with statistics."""
-        books = self.db.get_all_books()
-        if not books:
-            console.print(MESSAGES["not_found"], style=STYLES["error"])
+        total_books, total_qty, total_value = self.db.get_stats()
+        if not total_books:
+            console.print(self.MSG_NOT_FOUND, style=self.ERR_STYLE)
             return
+        low_stock = self.db.get_low_stock(LOW_STOCK_THRESHOLD)
 
-        total_books = len(books)
-        total_qty = sum(b["quantity"] for b in books)
-        total_value = sum(b["price"] * b["quantity"] for b in books)
-        low_stock = [b for b in books if b["quantity"] < 3]
-
-        console.print(Panel(TITLES["dashboard"], style=STYLES["info"]))
+        console.print(Panel(TITLES["dashboard"], style=self.INFO_STYLE))
         console.print(
             f"📊 [bold]Inventory Summary:[/bold]\n"
             f"• Total Books: [cyan]{total_books}[/cyan]\n"
             f"• Total Quantity: [cyan]{total_qty}[/cyan]\n"
-            f"• Total Value: [green]R{total_value:.2f}[/green]"
+            f"• Total Value: [green]{_fmt_price(total_value)}[/green]"
         )
 
         if low_stock:
             console.print(
-                "\n⚠️ [bold red]Low Stock Items (quantity < 3):"
-                "[/bold red]")
+                "\n⚠️ [bold red]Low Stock Items "
+                f"(quantity < {LOW_STOCK_THRESHOLD}):[/bold red]")
             self._display_books(low_stock)
         else:
             console.print("\n✅ [green]All items have sufficient stock[/green]")
 
-    def _display_books(self, books: List[Dict[str, Any]]):
-        """Display multiple books in a formatted table."""
-        table = Table(
+    def _display_books(self, books: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Display multiple books in a formatted table.
+
+        Returns:
+            bool: True if at least one book was shown
+        """
+        if PLAIN_OUTPUT:
+            return self._print_plain_books(books)
+
+        table = self._new_books_table()
+        for book in books:
+            quantity = book["quantity"]
+            table.add_row(
+                str(book["id"]),
+                book["title"],
+                book["author"],
+                Text(str(quantity), style=(
+                    RED if quantity < LOW_STOCK_THRESHOLD else GREEN
+                )),
+                _fmt_price(book["price"])
+            )
+
+        if not table.row_count:
+            return False
+        console.print(table)
+        return True
+
+    def _new_books_table(self) -> "Table":
+        """Create an empty table with the book list columns."""
+        table = _table_class()(
             title="📚 Books",
             show_header=True,
             header_style="bold magenta"
@@ -947,18 +1320,24 @@ class BookManager:
         table.add_column("Author", min_width=18)
         table.add_column("Qty", justify="right", width=6)
         table.add_column("Price", justify="right", width=10)
+        return table
+
+    def _print_plain_books(self, books: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Write books as tab-separated lines for non-terminal output.
 
+        Returns:
+            bool: True if at least one book was written
+        """
+        shown = False
+        write = sys.stdout.write
         for book in books:
-            stock_style = "red" if book["quantity"] < 3 else "green"
-            table.add_row(
-                str(book["id"]),
-                book["title"],
-                book["author"],
-                f"[{stock_style}]{book['quantity']}[/{stock_style}]",
-                f"R{book['price']:.2f}"
+            write(
+                f"{book['id']}\t{book['title']}\t{book['author']}\t"
+                f"{book['quantity']}\t{book['price']}\n"
             )
-
-        console.print(table)
+            shown = True
+        return shown
 
     def _display_book(self, book: Dict[str, Any]):
         """Display a single book's details."""